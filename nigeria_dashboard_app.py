@@ -1,18 +1,32 @@
 import streamlit as st
 from nigeria_data_processor import load_and_process_data
 import pandas as pd
+import numpy as np
+import pyarrow as pa
+import pyarrow.compute as pc
 import plotly.express as px
+import math
 
 
 @st.cache_data
 def load_and_process_data_cached():
     """
     Load and process data using a caching mechanism.
+
+    The dataset is indexed by year (the "Year" column is kept) so single-year
+    lookups are direct index hits. Rows arrive sorted by year from
+    load_and_process_data, which the year bounds and range slicing rely on.
     
     Returns:
-        pd.DataFrame: Processed dataset.
+        tuple: Processed dataset (pd.DataFrame), first and last years (int, int)
+            and the indicator names available for selection (tuple of str).
     """
-    return load_and_process_data()
+    data = load_and_process_data().set_index("Year", drop=False)
+    # Rows are sorted by year, so the bounds are the first and last entries
+    year_min = int(data["Year"].iat[0])
+    year_max = int(data["Year"].iat[-1])
+    indicator_options = tuple(col for col in data.columns if col != "Year")
+    return data, year_min, year_max, indicator_options
 
 
 def end_before_start(start_year, end_year):
@@ -30,22 +44,27 @@ def end_before_start(start_year, end_year):
 
 
 @st.cache_data
-def min_max_normalize(data, indicator):
+def min_max_normalize(series):
     """
     Apply min-max normalization to scale data between 0 and 1.
 
     Args:
-        data (pd.DataFrame): Input dataset.
-        indicator (str): Column to normalize.
+        series (pd.Series): Indicator values to normalize.
 
     Returns:
-        pd.Series: Normalized values for the specified column.
+        pd.Series: Normalized values, aligned with the input index.
     """
-    min_val = data[indicator].min()
-    max_val = data[indicator].max()
-    if max_val - min_val == 0:
-        return data[indicator]  # Avoid division by zero
-    return (data[indicator] - min_val) / (max_val - min_val)
+    values = series.to_numpy(dtype=float)
+    # Single pass over the column; NaNs become nulls and are skipped
+    extremes = pc.min_max(pa.array(values, from_pandas=True))
+    min_val, max_val = extremes["min"].as_py(), extremes["max"].as_py()
+    if min_val is None or max_val - min_val == 0:
+        return series  # Avoid division by zero
+    return pd.Series((values - min_val) / (max_val - min_val), index=series.index, name=series.name)
+
+
+# Scale and suffix for each power of one thousand used by format_large_numbers
+_UNIT_TABLE = ((1, ""), (1e3, " Thousand"), (1e6, " Million"), (1e9, " Billion"))
 
 
 def format_large_numbers(value):
@@ -58,14 +77,120 @@ def format_large_numbers(value):
     Returns:
         str: Formatted string.
     """
-    if value >= 1e9:
-        return f"{value / 1e9:.2f} Billion"
-    elif value >= 1e6:
-        return f"{value / 1e6:.2f} Million"
-    elif value >= 1e3:
-        return f"{value / 1e3:.2f} Thousand"
-    else:
-        return f"{value:.2f}"
+    exponent = 0
+    if value >= 1e3:
+        # Clamp the log so infinite values map to the largest unit instead of overflowing int()
+        exponent = min(3, int(min(math.log10(value), 9)) // 3)
+        if value < _UNIT_TABLE[exponent][0]:
+            exponent -= 1  # log10 rounded up just below a unit boundary
+    scale, suffix = _UNIT_TABLE[exponent]
+    return f"{value / scale:.2f}{suffix}"
+
+
+def format_large_numbers_array(values):
+    """
+    Format an array of numbers into readable units, matching format_large_numbers.
+
+    Args:
+        values (array-like): Numeric values to format.
+
+    Returns:
+        list: Formatted strings, one per value.
+    """
+    values = np.asarray(values, dtype=float)
+    units = _UNIT_TABLE[:0:-1]  # Largest unit first, as np.select takes the first matching condition
+    conditions = [values >= unit_scale for unit_scale, _ in units]
+    scale = np.select(conditions, [unit_scale for unit_scale, _ in units], default=_UNIT_TABLE[0][0])
+    suffix = np.select(conditions, [unit_suffix for _, unit_suffix in units], default=_UNIT_TABLE[0][1])
+    return [f"{value:.2f}{unit}" for value, unit in zip(values / scale, suffix)]
+
+
+@st.cache_data(show_spinner=False)
+def _build_trend_fig(data, indicator, start_year, end_year):
+    """
+    Build the line chart for the trend analysis tab.
+
+    Args:
+        data (pd.DataFrame): Dataset restricted to the selected years.
+        indicator (str): Indicator to plot.
+        start_year (int): Start year for analysis.
+        end_year (int): End year for analysis.
+
+    Returns:
+        plotly.graph_objects.Figure: Trend line chart.
+    """
+    fig = px.line(
+        data,
+        x="Year",
+        y=indicator,
+        title=f"{indicator} Trend ({start_year}-{end_year})",
+        labels={"Year": "Year", indicator: f"{indicator}"},
+        markers=True,
+    )
+    fig.update_layout(
+        xaxis=dict(showgrid=True),
+        yaxis=dict(showgrid=True),
+        template="plotly_white",
+    )
+    return fig
+
+
+@st.cache_data(show_spinner=False)
+def _build_compare_fig(comparison_df, indicator, start_year, end_year):
+    """
+    Build the bar chart for the yearly comparison tab.
+
+    Args:
+        comparison_df (pd.DataFrame): Two rows of "Year" and "Value".
+        indicator (str): Indicator being compared.
+        start_year (int): Start year for analysis.
+        end_year (int): End year for analysis.
+
+    Returns:
+        plotly.graph_objects.Figure: Comparison bar chart.
+    """
+    fig = px.bar(
+        comparison_df,
+        x="Year",
+        y="Value",
+        title=f"{indicator} Comparison ({start_year} vs {end_year})",
+        labels={"Value": f"{indicator} Value", "Year": "Year"},
+        text=format_large_numbers_array(comparison_df["Value"]),  # Ensure text matches y-axis values
+    )
+    fig.update_traces(
+        textposition="inside"  # Place labels inside the bars
+    )
+    fig.update_layout(
+        template="plotly_white",
+        xaxis=dict(type="category", categoryorder="array", categoryarray=[start_year, end_year]),
+        yaxis=dict(showgrid=True),
+        bargap=0.4,
+    )
+    return fig
+
+
+@st.cache_data(show_spinner=False)
+def _build_relationship_fig(line_data, x_indicator, y_indicator):
+    """
+    Build the normalized line chart for the indicator relationships tab.
+
+    Args:
+        line_data (pd.DataFrame): Dataset with normalized indicator columns.
+        x_indicator (str): First indicator to plot.
+        y_indicator (str): Second indicator to plot.
+
+    Returns:
+        plotly.graph_objects.Figure: Normalized comparison line chart.
+    """
+    fig = px.line(
+        line_data,
+        x="Year",
+        y=[x_indicator, y_indicator],
+        labels={"Year": "Year", "value": "Normalized Value", "variable": "Indicator"},
+        markers=True,
+    )
+    fig.update_layout(template="plotly_white")
+    return fig
 
 
 def display_dashboard(data, start_year, end_year, indicator, related_indicators):
@@ -77,30 +202,19 @@ def display_dashboard(data, start_year, end_year, indicator, related_indicators)
         start_year (int): Start year for analysis.
         end_year (int): End year for analysis.
         indicator (str): Selected indicator for analysis.
-        related_indicators (list): List of indicators for comparison.
+        related_indicators (tuple): Indicators available for comparison.
     """
+    # Select the year window once; the index is sorted by year, so a label slice needs no comparisons
+    filtered_data = data.loc[start_year:end_year]
+
     tab1, tab2, tab3 = st.tabs(["📈 Trend Analysis", "📊 Compare Years", "🔗 Indicator Relationships"])
 
     # Tab 1: Trend Analysis
     with tab1:
         st.subheader(f"{indicator} Trend from {start_year} to {end_year}")
-        filtered_data = data[(data["Year"] >= start_year) & (data["Year"] <= end_year)]
-
         if not filtered_data.empty:
-            fig = px.line(
-                filtered_data,
-                x="Year",
-                y=indicator,
-                title=f"{indicator} Trend ({start_year}-{end_year})",
-                labels={"Year": "Year", indicator: f"{indicator}"},
-                markers=True,
-            )
-            fig.update_layout(
-                xaxis=dict(showgrid=True),
-                yaxis=dict(showgrid=True),
-                template="plotly_white",
-            )
-            st.plotly_chart(fig, use_container_width=True)
+            fig = _build_trend_fig(filtered_data, indicator, start_year, end_year)
+            st.plotly_chart(fig, use_container_width=True, theme=None)
         else:
             st.error("No data available for the selected range.")
 
@@ -108,11 +222,14 @@ def display_dashboard(data, start_year, end_year, indicator, related_indicators)
     with tab2:
         st.subheader(f"Comparison of {indicator} between {start_year} and {end_year}")
 
-        initial_value = data.loc[data["Year"] == start_year, indicator].values
-        final_value = data.loc[data["Year"] == end_year, indicator].values
-
-        initial_value = initial_value[0] if initial_value.size > 0 else None
-        final_value = final_value[0] if final_value.size > 0 else None
+        try:
+            initial_value = data.at[start_year, indicator]
+        except KeyError:
+            initial_value = None
+        try:
+            final_value = data.at[end_year, indicator]
+        except KeyError:
+            final_value = None
 
         comparison_df = pd.DataFrame({
             "Year": [start_year, end_year],
@@ -132,24 +249,8 @@ def display_dashboard(data, start_year, end_year, indicator, related_indicators)
             else:
                 st.write(f"No data for {end_year}")
 
-        fig = px.bar(
-            comparison_df,
-            x="Year",
-            y="Value",
-            title=f"{indicator} Comparison ({start_year} vs {end_year})",
-            labels={"Value": f"{indicator} Value", "Year": "Year"},
-            text=comparison_df["Value"].apply(format_large_numbers),  # Ensure text matches y-axis values
-        )
-        fig.update_traces(
-            textposition="inside"  # Place labels inside the bars
-        )
-        fig.update_layout(
-            template="plotly_white",
-            xaxis=dict(type="category", categoryorder="array", categoryarray=[start_year, end_year]),
-            yaxis=dict(showgrid=True),
-            bargap=0.4,
-        )
-        st.plotly_chart(fig, use_container_width=True)
+        fig = _build_compare_fig(comparison_df, indicator, start_year, end_year)
+        st.plotly_chart(fig, use_container_width=True, theme=None)
 
     # Tab 3: Indicator Relationships (Normalized)
     with tab3:
@@ -173,20 +274,16 @@ def display_dashboard(data, start_year, end_year, indicator, related_indicators)
             key="y_indicator_relationship"
         )
 
-        # Normalize the selected indicators
-        line_data = data[(data["Year"] >= start_year) & (data["Year"] <= end_year)].copy()
-        line_data[x_indicator] = min_max_normalize(line_data, x_indicator)
-        line_data[y_indicator] = min_max_normalize(line_data, y_indicator)
+        # Normalize the selected indicators into a frame holding only the plotted columns
+        line_data = pd.DataFrame({
+            "Year": filtered_data["Year"].to_numpy(),
+            x_indicator: min_max_normalize(filtered_data[x_indicator]).to_numpy(),
+            y_indicator: min_max_normalize(filtered_data[y_indicator]).to_numpy(),
+        })
 
         if not line_data.empty:
-            fig = px.line(
-                line_data,
-                x="Year",
-                y=[x_indicator, y_indicator],
-                labels={"Year": "Year", "value": "Normalized Value", "variable": "Indicator"},
-                markers=True,
-            )
-            st.plotly_chart(fig, use_container_width=True)
+            fig = _build_relationship_fig(line_data, x_indicator, y_indicator)
+            st.plotly_chart(fig, use_container_width=True, theme=None)
         else:
             st.error("No data available for the selected range.")
 
@@ -197,22 +294,22 @@ def main():
     Main function to run the Streamlit application.
     """
     st.title("Nigeria Economic and Demographic Dashboard")
-    data = load_and_process_data_cached()
+    data, year_min, year_max, indicator_options = load_and_process_data_cached()
 
     with st.expander("See full data table"):
-        display_df = data.copy()
-        display_df["Year"] = display_df["Year"].astype(str)
-        st.dataframe(display_df)
+        st.dataframe(
+            data,
+            column_config={"Year": st.column_config.NumberColumn(format="%d")},
+            hide_index=True,
+        )
 
     st.info("Explore more global economic and demographic data on [World Bank Open Data](https://data.worldbank.org/).")
 
-    indicator_options = [col for col in data.columns if col != "Year"]
-
     col1, col2, col3 = st.columns(3)
     with col1:
-        start_year = st.slider("Start Year", min_value=int(data["Year"].min()), max_value=int(data["Year"].max()), value=1999)
+        start_year = st.slider("Start Year", min_value=year_min, max_value=year_max, value=1999)
     with col2:
-        end_year = st.slider("End Year", min_value=int(data["Year"].min()), max_value=int(data["Year"].max()), value=2023)
+        end_year = st.slider("End Year", min_value=year_min, max_value=year_max, value=2023)
     with col3:
         indicator = st.selectbox("Indicator", options=indicator_options, index=0)
 
@@ -1,16 +1,21 @@
 import pandas as pd
 import numpy as np
 import os
+import tempfile
 
 
 def load_and_process_data():
     """
     Load and process the Nigeria indicators dataset.
 
+    The processed DataFrame is saved as a Parquet file next to the CSV and
+    reused on later calls, as long as it is newer than both the CSV and this
+    module.
+
     Steps:
     1. Load the CSV file dynamically.
     2. Rename columns to more concise and user-friendly names.
-    3. Ensure the 'Year' column is properly formatted as integers.
+    3. Ensure the 'Year' column is properly formatted as integers and sorted.
     4. Convert columns to appropriate data types.
     5. Handle scientific notation for GDP values.
     6. Replace zero values for 2023 with NaN for better clarity.
@@ -20,9 +25,19 @@ def load_and_process_data():
     """
     # Construct the file path dynamically
     file_path = os.path.join(os.path.dirname(__file__), 'nigeria_indicators_data.csv')
+    parquet_path = os.path.splitext(file_path)[0] + '.parquet'
+
+    # Reuse the processed Parquet file if neither the CSV nor this processing code has changed since
+    if os.path.exists(parquet_path):
+        source_mtime = max(os.path.getmtime(file_path), os.path.getmtime(__file__))
+        if os.path.getmtime(parquet_path) > source_mtime:
+            try:
+                return pd.read_parquet(parquet_path)
+            except (OSError, ValueError):
+                pass  # Unreadable file (e.g. a partial write); rebuild it from the CSV below
 
-    # Load the CSV file into a DataFrame
-    df = pd.read_csv(file_path)
+    # Load the CSV file into a DataFrame using the multi-threaded Arrow parser
+    df = pd.read_csv(file_path, engine="pyarrow")
 
     # Rename columns for better readability and usability
     rename_columns = {
@@ -44,12 +59,16 @@ def load_and_process_data():
         "Unemployment, total (% of total labor force) ": "Unemployment (%)",
     }
 
-    # Apply column renaming
-    df.rename(columns=rename_columns, inplace=True)
+    # Apply column renaming, skipping entries that keep the original name
+    rename_columns = {old: new for old, new in rename_columns.items() if old != new}
+    df = df.rename(columns=rename_columns)
 
     # Ensure the "Year" column is treated as integer type
     # Keep only the last 4 digits of the year if there's an unexpected formatting
-    df["Year"] = df["Year"].apply(lambda x: int(str(x)[-4:]))
+    df["Year"] = pd.to_numeric(df["Year"].astype(str).str[-4:])
+
+    # Keep rows in chronological order so year ranges can be sliced directly
+    df = df.sort_values("Year", ignore_index=True)
 
     # Define the desired data type conversions for each column
     convert_dtype = {
@@ -71,16 +90,41 @@ def load_and_process_data():
         "Unemployment (%)": np.float64,
     }
 
-    # Apply the type conversion to the DataFrame
-    df = df.astype(convert_dtype)
+    # Apply the type conversion only to columns that exist and are not already of the target type
+    needs_cast = {
+        column: dtype
+        for column, dtype in convert_dtype.items()
+        if column in df.columns and df[column].dtype != np.dtype(dtype)
+    }
+    if needs_cast:
+        df = df.astype(needs_cast)
 
     # Convert GDP values to float without scientific notation, rounded to integers
-    df['GDP (US$)'] = df['GDP (US$)'].apply(lambda x: float(f"{x:.0f}"))
+    # (np.rint rounds half to even like the ".0f" format and leaves NaN untouched)
+    df['GDP (US$)'] = np.rint(df['GDP (US$)'].to_numpy())
 
     # Replace zero values in 2023 with NaN for all columns except "Year"
-    for column in df.columns:
-        if column != "Year":
-            df.loc[(df["Year"] == 2023) & (df[column] == 0), column] = np.nan
+    value_columns = df.columns.drop("Year")
+    rows_2023 = df["Year"].to_numpy() == 2023
+    values_2023 = df.loc[rows_2023, value_columns]
+    df.loc[rows_2023, value_columns] = values_2023.mask(values_2023 == 0)
+
+    # Save the processed DataFrame for faster loading next time (skip if the directory is read-only).
+    # Write to a temporary file first so an interrupted write never leaves a partial Parquet file in place.
+    try:
+        fd, tmp_path = tempfile.mkstemp(dir=os.path.dirname(parquet_path), suffix='.parquet.tmp')
+    except OSError:
+        tmp_path = None
+    if tmp_path is not None:
+        os.close(fd)
+        try:
+            df.to_parquet(tmp_path, compression="zstd", index=False)
+            os.replace(tmp_path, parquet_path)
+        except OSError:
+            pass
+        finally:
+            if os.path.exists(tmp_path):
+                os.remove(tmp_path)
 
     # Return the cleaned and processed DataFrame
     return df